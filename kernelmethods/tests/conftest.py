@@ -0,0 +1,34 @@
+
+import numpy as np
+from pytest import fixture
+
+# fixed seed, so that the randomly generated test data is the same across runs
+random_seed = 42
+
+num_samples = 50
+sample_dim = 3
+pool_size = 10000
+
+
+@fixture
+def rng():
+    """Freshly seeded for each test, so draws do not depend on the order of tests"""
+
+    return np.random.default_rng(random_seed)
+
+
+@fixture(scope="session")
+def sample_data():
+    """Sample shared across tests - must not be modified in place!"""
+
+    return np.random.default_rng(random_seed).random((num_samples, sample_dim))
+
+
+@fixture(scope="session")
+def random_pool():
+    """
+    Pool of random values allocated once, to draw small test arrays from
+    via slicing and reshaping. Views of it must not be modified in place!
+    """
+
+    return np.random.default_rng(random_seed).random(pool_size)
@@ -1,31 +1,40 @@
 
 import numpy as np
-from pytest import raises
+from pytest import fixture, raises
 
 from kernelmethods.base import KMSetAdditionError, KernelMatrix, KernelSet, \
     BaseKernelFunction
 from kernelmethods.numeric_kernels import GaussianKernel, LinearKernel, PolyKernel
+from kernelmethods.operations import alignment_centered
 from kernelmethods.sampling import make_kernel_bucket
 
-num_samples = 50 # 9
-sample_dim = 3 # 2
 target_label_set = [1, 2]
 
-sample_data = np.random.rand(num_samples, sample_dim)
-target_labels = np.random.choice(target_label_set, (num_samples, 1))
 
-IdealKM = target_labels.dot(target_labels.T)
+@fixture
+def ideal_km(sample_data, rng):
+    target_labels = rng.choice(target_label_set, sample_data.shape[0])
+    # float labels let the outer product use BLAS, unlike integer ones
+    target_labels = target_labels.astype(np.float64)
+    return np.outer(target_labels, target_labels)
 
-rbf = KernelMatrix(GaussianKernel(sigma=10, skip_input_checks=True))
-lin = KernelMatrix(LinearKernel(skip_input_checks=True))
-poly = KernelMatrix(PolyKernel(degree=2, skip_input_checks=True))
 
-# lin.attach_to(sample_data)
-# rbf.attach_to(sample_data)
-# poly.attach_to(sample_data)
+@fixture(scope="module")
+def kernel_matrices():
+    """rbf, lin and poly kernel matrices, in that order"""
+
+    rbf = KernelMatrix(GaussianKernel(sigma=10, skip_input_checks=True))
+    lin = KernelMatrix(LinearKernel(skip_input_checks=True))
+    poly = KernelMatrix(PolyKernel(degree=2, skip_input_checks=True))
+
+    return rbf, lin, poly
+
+
+@fixture(scope="module")
+def kset(kernel_matrices):
+    rbf, lin, poly = kernel_matrices
+    return KernelSet([lin, poly, rbf])
 
-kset = KernelSet([lin, poly, rbf])
-print(kset)
 
 def test_creation():
 
@@ -37,7 +46,7 @@ def test_creation():
     with raises(TypeError):
         ks = KernelSet(km_list='blah')
 
-def test_size_property_mismatch():
+def test_size_property_mismatch(sample_data):
 
     ks = KernelSet(num_samples=sample_data.shape[0]+1)
     lin = KernelMatrix(LinearKernel(skip_input_checks=True))
@@ -46,12 +55,12 @@ def test_size_property_mismatch():
         ks.append(lin)
 
 
-def test_size():
+def test_size(kset):
 
     assert kset.size == 3
     assert len(kset) == 3
 
-def test_get_item():
+def test_get_item(kset):
     """access by index"""
 
     for invalid_index in [-1, kset.size]:
@@ -63,7 +72,7 @@ def test_get_item():
             print(kset[invalid_index])
 
 
-def test_get_ker_funcs():
+def test_get_ker_funcs(kset):
 
     for index in (0, 1):
         kf_list = kset.get_kernel_funcs([index, ])
@@ -71,14 +80,14 @@ def test_get_ker_funcs():
             if not isinstance(kf, BaseKernelFunction):
                 raise TypeError('get_kernel_funcs not returning proper output type')
 
-def test_take():
+def test_take(kset, rng):
     """access by index"""
 
     for invalid_index in [-1, kset.size]:
         with raises(IndexError):
             print(kset.take([invalid_index]))
 
-    for valid_index in np.random.randint(0, min(kset.size, 3), 3):
+    for valid_index in rng.integers(0, min(kset.size, 3), 3):
         _ks = kset.take(valid_index)
         if not isinstance(_ks, KernelSet):
             raise TypeError('.take not returning KernelSet')
@@ -90,8 +99,9 @@ def test_take():
     assert isinstance(k2, KernelSet)
     assert k2.size == 2
 
-def test_extend():
+def test_extend(kset, kernel_matrices):
 
+    rbf, lin, poly = kernel_matrices
     kset1 = KernelSet([poly, rbf, lin])
     kset2 = KernelSet([poly, rbf])
     kset1.extend(kset2)
@@ -107,14 +117,14 @@ def test_extend():
         kset1.extend(k4_diff_size)
 
 
-def test_attributes():
+def test_attributes(kset, sample_data, rng):
 
     kset.set_attr('name', 'linear')
     for km in kset:
         assert km.get_attr('name') == 'linear'
         assert km.get_attr('noname', '404') == '404'
 
-    values = np.random.rand(kset.size)
+    values = rng.random(kset.size)
     kset.set_attr('weight', values)
     for ii, km in enumerate(kset):
         assert km.get_attr('weight') == values[ii]
@@ -127,11 +137,12 @@ def test_attributes():
 
     kb.get_attr('a')
 
-#
-# print('Alignment to Ideal Kernel:')
-# ag = np.zeros(kb.size)
-# for ix, km in enumerate(kb):
-#     ag[ix] = alignment_centered(km.full, IdealKM)
-#     print('{:4} {:>60} : {:10.5f}'.format(ix, str(km),ag[ix]))
 
-test_take()
+def test_alignment_to_ideal_km(kset, sample_data, ideal_km):
+
+    for km in kset:
+        # fresh instance to not reset the attributes of shared kset members
+        attached = KernelMatrix(km.kernel)
+        attached.attach_to(sample_data)
+        alignment = alignment_centered(attached.full, ideal_km)
+        assert -1.0 <= alignment <= 1.0
@@ -25,6 +25,7 @@ np.random.seed(42)
 # default values for parameters
 
 num_tests_psd_kernel = 3
+num_pairs_value_test = 50
 
 def gen_random_array(dim):
     """To better control precision and type of floats"""
@@ -90,6 +91,20 @@ def test_kernel_design():
                 _ = kernel(non_num, non_num)
 
 
+def _test_kernel_values(kernel, reference, sample_dim):
+    """Compares pairwise kernel values to a vectorized reference over all pairs.
+
+    reference must accept two samples X and Y, and return the kernel values
+    between their corresponding rows in a single call.
+    """
+
+    X = gen_random_sample(num_pairs_value_test, sample_dim)
+    Y = gen_random_sample(num_pairs_value_test, sample_dim)
+
+    values = np.array([kernel(x, y) for x, y in zip(X, Y)])
+    assert np.allclose(values, reference(X, Y))
+
+
 def _test_func_is_valid_kernel(kernel, sample_dim, num_samples):
     """A func is a valid kernel if the kernel matrix generated by it is PSD.
 
@@ -120,6 +135,48 @@ def test_polynomial_kernel(sample_dim, num_samples,
     _test_func_is_valid_kernel(poly, sample_dim, num_samples)
 
 
+@hyp_settings(max_examples=num_tests_psd_kernel, deadline=None,
+              suppress_health_check=HealthCheck.all())
+@given(strategies.integers(range_feature_dim[0], range_feature_dim[1]),
+       strategies.integers(range_polynomial_degree[0], range_polynomial_degree[1]),
+       strategies.floats(min_value=0, max_value=1e3,
+                         allow_nan=False, allow_infinity=False))
+def test_polynomial_kernel_values(sample_dim, poly_degree, poly_intercept):
+    """Compares pairwise values of Polynomial kernel to a vectorized reference."""
+
+    def reference(X, Y):
+        # row-wise dot products for all the pairs in a single call
+        return (poly_intercept + np.einsum('ij,ij->i', X, Y)) ** poly_degree
+
+    poly = PolyKernel(degree=poly_degree, b=poly_intercept, skip_input_checks=False)
+    _test_kernel_values(poly, reference, sample_dim)
+
+
+def test_polynomial_kernel_gram():
+    """Batch computation of kernel matrix must match the pairwise KernelMatrix"""
+
+    poly = PolyKernel(degree=3, gamma=0.5, b=2.0)
+    sample_one = gen_random_sample(range_num_samples[0], default_feature_dim)
+    sample_two = gen_random_sample(range_num_samples[1], default_feature_dim)
+
+    km = KernelMatrix(poly, normalized=False)
+    km.attach_to(sample_one)
+    assert np.allclose(poly.gram(sample_one), km.full)
+
+    km.attach_to(sample_one, sample_two=sample_two, name_two='two')
+    assert np.allclose(poly.gram(sample_one, sample_two), km.full)
+
+    with raises(ValueError):
+        poly.gram(sample_one, sample_two[:, :-1])
+
+    assert poly.gram(sample_one, sample_two[:0]).shape == (sample_one.shape[0], 0)
+
+    # large enough to be computed in multiple blocks
+    large_sample = gen_random_sample(1100, default_feature_dim)
+    expected = (2.0 + 0.5 * np.dot(large_sample, large_sample.T)) ** 3
+    assert np.allclose(poly.gram(large_sample), expected)
+
+
 @hyp_settings(max_examples=num_tests_psd_kernel, deadline=None,
               suppress_health_check=HealthCheck.all())
 @given(strategies.integers(range_feature_dim[0], range_feature_dim[1]),
@@ -133,6 +190,24 @@ def test_gaussian_kernel(sample_dim, num_samples, sigma):
     _test_for_all_kernels(gaussian, sample_dim)
     _test_func_is_valid_kernel(gaussian, sample_dim, num_samples)
 
+
+@hyp_settings(max_examples=num_tests_psd_kernel, deadline=None,
+              suppress_health_check=HealthCheck.all())
+@given(strategies.integers(range_feature_dim[0], range_feature_dim[1]),
+       strategies.floats(min_value=0, max_value=1e6,
+                         allow_nan=False, allow_infinity=False))
+def test_gaussian_kernel_values(sample_dim, sigma):
+    """Compares pairwise values of Gaussian kernel to a vectorized reference."""
+
+    gaussian = GaussianKernel(sigma=sigma, skip_input_checks=False)
+
+    def reference(X, Y):
+        diff = X - Y
+        return np.exp(-gaussian.gamma * np.einsum('ij,ij->i', diff, diff))
+
+    _test_kernel_values(gaussian, reference, sample_dim)
+
+
 @hyp_settings(max_examples=num_tests_psd_kernel, deadline=None,
               suppress_health_check=HealthCheck.all())
 @given(strategies.integers(range_feature_dim[0], range_feature_dim[1]),
@@ -190,6 +265,32 @@ def test_chi2_kernel(sample_dim, num_samples, gamma):
     _test_func_is_valid_kernel(chi2, sample_dim, num_samples)
 
 
+def test_integer_inputs():
+    """Integer and reduced precision inputs must be computed in float64"""
+
+    x = np.array([200, 10, 0], dtype=np.uint8)
+    y = np.array([10, 200, 0], dtype=np.uint8)
+
+    gaussian = GaussianKernel(sigma=100)
+    assert np.isclose(gaussian(x, y), np.exp(-gaussian.gamma * 2 * 190 ** 2))
+
+    linear = LinearKernel()
+    assert linear(x, x) == 200 ** 2 + 10 ** 2
+
+    z = np.array([100, 100], dtype=np.int8)
+    assert linear(z, z) == 20000
+
+    # reduced precision floats must be upcast as well
+    poly = PolyKernel(degree=2, b=0)
+    half = np.array([300], dtype=np.float16)
+    assert np.isclose(poly(half, half), 300.0 ** 4)
+
+    poly = PolyKernel(degree=3)
+    single = np.array([1e6, 1.0, 1.0], dtype=np.float32)
+    assert np.isclose(poly(single, single), (1.0 + 1e12 + 2.0) ** 3,
+                      rtol=1e-12, atol=0)
+
+
 def test_chi2_kernel_misc():
     """Tests specific for Laplacian kernel."""
 
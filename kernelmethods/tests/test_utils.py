@@ -1,13 +1,18 @@
 
 import numpy as np
 from pytest import raises
+from scipy.sparse import csr_matrix, lil_matrix
 
 from kernelmethods.numeric_kernels import (GaussianKernel, LaplacianKernel,
                                            LinearKernel, PolyKernel)
-from kernelmethods.utils import (check_callable, check_input_arrays,
-                                 check_operation_kernel_matrix, ensure_ndarray_1D,
+from kernelmethods.utils import (_ensure_min_eps, _float_eps, check_callable,
+                                 check_input_arrays, check_operation_kernel_matrix,
+                                 contains_nan_inf, ensure_ndarray_1D,
                                  ensure_ndarray_2D,
-                                 get_callable_name, not_symmetric)
+                                 get_callable_name, is_iterable_but_not_str,
+                                 min_max_scale, not_symmetric)
+
+np.random.seed(42)
 
 default_feature_dim = 10
 range_feature_dim = [10, 500]
@@ -17,8 +22,6 @@ sample_dim = np.random.randint(10)
 
 range_polynomial_degree = [2, 10] # degree=1 is tested in LinearKernel()
 
-np.random.seed(42)
-
 # choosing skip_input_checks=False will speed up test runs
 # default values for parameters
 SupportedKernels = (GaussianKernel(), PolyKernel(), LinearKernel(),
@@ -26,13 +29,30 @@ SupportedKernels = (GaussianKernel(), PolyKernel(), LinearKernel(),
 num_tests_psd_kernel = 3
 
 
-def test_check_input_arrays():
+def test_check_input_arrays(random_pool):
 
     with raises(ValueError):
-        check_input_arrays(np.random.rand(10, 5), np.random.rand(5, 4))
+        check_input_arrays(random_pool[:50].reshape(10, 5),
+                           random_pool[50:70].reshape(5, 4))
 
     with raises(ValueError):
-        check_input_arrays(np.random.rand(10), np.random.rand(5))
+        check_input_arrays(random_pool[:10], random_pool[10:15])
+
+    x, y = random_pool[:10], random_pool[10:20]
+    x_out, y_out = check_input_arrays(x, y)
+    assert x_out is x and y_out is y
+
+    x_out, _ = check_input_arrays(x.astype('float32'), y.astype('float32'),
+                                  ensure_dtype=np.float64)
+    assert x_out.dtype == np.float64
+
+    x_out, _ = check_input_arrays(x.astype('float16'), y.astype('float16'),
+                                  ensure_dtype=np.float64)
+    assert x_out.dtype == np.float64
+
+    words = np.array(['a', 'b'])
+    w_out, _ = check_input_arrays(words, words, ensure_dtype=np.character)
+    assert w_out is words
 
     # from scipy.sparse import csr_matrix
     # s1 = csr_matrix((3,4))
@@ -47,26 +67,60 @@ def test_valid_op():
 
     from kernelmethods.config import VALID_KERNEL_MATRIX_OPS
     for valid_op in VALID_KERNEL_MATRIX_OPS:
-        _ = check_operation_kernel_matrix(valid_op)
+        assert check_operation_kernel_matrix(valid_op) == valid_op
+        assert check_operation_kernel_matrix(valid_op.upper()) == valid_op
+
+def test_ensure_array_dim(random_pool):
+
+    with raises(ValueError):
+        ensure_ndarray_2D(random_pool[:50].reshape(10, 5), ensure_num_cols=3)
 
-def test_ensure_array_dim():
+    with raises(ValueError):
+        ensure_ndarray_2D(random_pool[:10], ensure_num_cols=3)
 
     with raises(ValueError):
-        ensure_ndarray_2D(np.random.rand(10, 5), ensure_num_cols=3)
+        ensure_ndarray_1D(random_pool[:50].reshape(10, 5))
 
     with raises(ValueError):
-        ensure_ndarray_2D(np.random.rand(10), ensure_num_cols=3)
+        ensure_ndarray_1D(random_pool[:500].reshape(10, 5, 10))
+
+    assert ensure_ndarray_1D(random_pool[:10].reshape(10, 1, 1)).shape == (10, )
+    assert ensure_ndarray_1D([[1], [2], [3]]).shape == (3, )
+    assert ensure_ndarray_2D(random_pool[:50].reshape(10, 5, 1)).shape == (10, 5)
+    assert ensure_ndarray_2D(random_pool[:5].reshape(1, 5)).shape == (1, 5)
+    assert ensure_ndarray_2D(random_pool[:50].reshape(5, 10).T).flags.c_contiguous
 
     with raises(ValueError):
-        ensure_ndarray_1D(np.random.rand(10, 5))
+        ensure_ndarray_1D(random_pool[:10].reshape(1, 10))
+
+    float_array = random_pool[:10]
+    assert ensure_ndarray_1D(float_array) is float_array
+    assert ensure_ndarray_1D(float_array, ensure_dtype=np.float64) is float_array
+    assert ensure_ndarray_1D([True, False]).dtype == np.float64
+    assert ensure_ndarray_1D([1, 2], ensure_dtype=np.float64).dtype == np.float64
+    int_array = np.arange(3)
+    assert ensure_ndarray_1D(int_array, ensure_dtype=np.floating).dtype == np.float64
 
     with raises(ValueError):
-        ensure_ndarray_1D(np.random.rand(10, 5, 10))
+        ensure_ndarray_1D(['a', 'b'])
+
+    # abstract numeric dtypes are recast to their numpy defaults
+    for abstract, concrete in ((np.integer, np.int64),
+                               (np.unsignedinteger, np.uint64),
+                               (np.complexfloating, np.complex128),
+                               (np.number, np.float64)):
+        recast = ensure_ndarray_1D([True, False], ensure_dtype=abstract)
+        assert recast.dtype == concrete
+    assert ensure_ndarray_1D(np.arange(3.), ensure_dtype=np.integer).dtype == np.int64
 
-def test_misc():
+    with raises(ValueError, match='abstract'):
+        ensure_ndarray_1D(np.arange(3.), ensure_dtype=np.character)
 
-    _ = get_callable_name(test_ensure_array_dim, 'test')
-    _ = get_callable_name('test_ensure_array_dim', None)
+def test_misc(random_pool, rng):
+
+    assert get_callable_name(test_ensure_array_dim, 'test') == 'test'
+    assert get_callable_name(test_ensure_array_dim) == 'test_ensure_array_dim'
+    assert get_callable_name('test_ensure_array_dim', None) == ''
 
     with raises(TypeError):
         check_callable('kdjkj')
@@ -83,3 +137,76 @@ def test_misc():
         check_callable(func_with_less_than_min_args, 3)
 
     assert not_symmetric(np.array([[1, 2], [1, 2]])) is True
+    assert not_symmetric(random_pool[:12].reshape(3, 4)) is True
+
+    sym = rng.random((600, 600))
+    sym = sym + sym.T
+    assert not_symmetric(sym) is False
+    sym[550, 10] += 1.0
+    assert not_symmetric(sym) is True
+    assert not_symmetric(sym.astype('float32')) is True
+
+    sym[550, 10] = sym[10, 550] = np.inf
+    assert not_symmetric(sym) is False
+    sym[550, 10] = np.nan
+    assert not_symmetric(sym) is True
+
+
+def test_contains_nan_inf(random_pool):
+
+    matrix = random_pool[:50].reshape(10, 5)
+    assert contains_nan_inf(matrix) is False
+
+    for bad_value in (np.nan, np.inf, -np.inf):
+        bad_matrix = matrix.copy()
+        bad_matrix[3, 2] = bad_value
+        assert contains_nan_inf(bad_matrix) is True
+
+        for sparse_fmt in (csr_matrix, lil_matrix):
+            assert contains_nan_inf(sparse_fmt(matrix)) is False
+            assert contains_nan_inf(sparse_fmt(bad_matrix)) is True
+
+
+def test_min_max_scale():
+
+    values = [3, 1, 5, 2]
+    scaled = min_max_scale(values)
+    assert np.allclose(scaled, [0.5, 0.0, 1.0, 0.25])
+    assert values == [3, 1, 5, 2]
+
+    assert np.allclose(min_max_scale(np.full(5, 7.0)), 0.0)
+
+
+def test_is_iterable_but_not_str(random_pool):
+
+    class ReIterable(object):
+
+        def __init__(self, length):
+            self.length = length
+
+        def __iter__(self):
+            return iter(range(self.length))
+
+    for valid in ([1, ], (1, 2), random_pool[:3], range(2), ReIterable(2)):
+        assert is_iterable_but_not_str(valid, min_length=1) is True
+
+    for invalid in ('string', 1, [], range(0), ReIterable(0),
+                    (val for val in range(3)), iter([1, 2])):
+        assert is_iterable_but_not_str(invalid, min_length=1) is False
+
+    assert is_iterable_but_not_str(ReIterable(2), min_length=3) is False
+
+
+def test_ensure_min_eps():
+
+    assert _ensure_min_eps(0.0) == _float_eps
+    assert _ensure_min_eps(2.0) == 2.0
+
+    values = np.array([-1.0, 0.0, 0.5])
+    clamped = _ensure_min_eps(values)
+    assert np.allclose(clamped, [_float_eps, _float_eps, 0.5])
+    assert values[0] == -1.0
+
+    clamped = _ensure_min_eps(values, out=values)
+    assert clamped is values
+    assert np.allclose(values, [_float_eps, _float_eps, 0.5])
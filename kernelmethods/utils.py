@@ -1,8 +1,11 @@
 
+from collections.abc import Iterable, Sized
+from functools import lru_cache
+from inspect import signature
+
 import numpy as np
 from scipy.sparse import issparse
 from kernelmethods import config
-from collections.abc import Iterable
 
 def check_input_arrays(x, y, ensure_dtype=np.number):
     """
@@ -28,6 +31,13 @@ def check_input_arrays(x, y, ensure_dtype=np.number):
 
     """
 
+    # fast path: inputs already of the exact dtype required are returned as is
+    if type(x) is np.ndarray and type(y) is np.ndarray and \
+        x.ndim == 1 and y.ndim == 1 and x.size == y.size and \
+        x.dtype == y.dtype and _is_subdtype(x.dtype, ensure_dtype) and \
+        _is_subdtype(_concrete_dtype(ensure_dtype), x.dtype):
+        return x, y
+
     x = ensure_ndarray_1D(x, ensure_dtype)
     y = ensure_ndarray_1D(y, ensure_dtype)
 
@@ -39,14 +49,18 @@ def check_input_arrays(x, y, ensure_dtype=np.number):
 
 
 def ensure_ndarray_2D(array, ensure_dtype=np.number, ensure_num_cols=None):
-    """Converts the input to a numpy array and ensure it is 1D."""
+    """Converts the input to a C-contiguous numpy array and ensure it is 2D.
+
+    Row-major layout keeps each sample contiguous in memory, as needed for the
+    many row-wise evaluations of the kernel function.
+    """
 
     if not isinstance(array, np.ndarray):
         array = np.asarray(array)
 
-    # squeezing only 3rd dim if they are singleton, leaving 1st & 2nd dim alone
-    axes_to_sqz = tuple(ax for ax, sz in enumerate(array.shape) if sz==1 and ax>1)
-    array = np.squeeze(array, axis=axes_to_sqz)
+    # dropping 3rd dim onwards if they are singleton, leaving 1st & 2nd dim alone
+    if array.ndim > 2 and all(sz == 1 for sz in array.shape[2:]):
+        array = array.reshape(array.shape[:2])
 
     array = ensure_ndarray_size(array, ensure_dtype=ensure_dtype, ensure_num_dim=2)
 
@@ -54,7 +68,7 @@ def ensure_ndarray_2D(array, ensure_dtype=np.number, ensure_num_cols=None):
         raise ValueError('The number of columns differ from expected {}'
                          ''.format(ensure_num_cols))
 
-    return array
+    return np.ascontiguousarray(array)
 
 
 def ensure_ndarray_1D(array, ensure_dtype=np.number):
@@ -63,9 +77,9 @@ def ensure_ndarray_1D(array, ensure_dtype=np.number):
     if not isinstance(array, np.ndarray):
         array = np.asarray(array)
 
-    # squeezing only 2nd, 3rd dim if they are singleton, leaving 1st dim alone
-    axes_to_sqz = tuple(ax for ax, sz in enumerate(array.shape) if sz==1 and ax>0)
-    array = np.squeeze(array, axis=axes_to_sqz)
+    # dropping 2nd dim onwards if they are singleton, leaving 1st dim alone
+    if array.ndim > 1 and all(sz == 1 for sz in array.shape[1:]):
+        array = array.reshape(array.shape[0])
 
     return ensure_ndarray_size(array, ensure_dtype=ensure_dtype, ensure_num_dim=1)
 
@@ -78,10 +92,15 @@ def ensure_ndarray_size(array, ensure_dtype=np.number, ensure_num_dim=1):
                          'It has {} dims with shape {} '
                          ''.format(ensure_num_dim, array.ndim, array.shape))
 
-    if not np.issubdtype(ensure_dtype, array.dtype):
+    if not _is_subdtype(array.dtype, ensure_dtype):
+        if ensure_dtype in (np.generic, np.flexible, np.character):
+            raise ValueError('Can not recast to abstract dtype {}! Specify a '
+                             'concrete dtype instead.'.format(ensure_dtype))
+
         prev_dtype = array.dtype
+        target_dtype = _concrete_dtype(ensure_dtype)
         try:
-            array = array.astype(ensure_dtype)
+            array = np.asarray(array, dtype=target_dtype)
         except:
             raise ValueError('Unable to recast input dtype from {} to required {}!'
                              ''.format(prev_dtype, ensure_dtype))
@@ -89,13 +108,34 @@ def ensure_ndarray_size(array, ensure_dtype=np.number, ensure_num_dim=1):
     return array
 
 
+@lru_cache(maxsize=64)
+def _is_subdtype(dtype_one, dtype_two):
+    """Cached version of np.issubdtype, as dtypes checked are few and repetitive"""
+
+    return np.issubdtype(dtype_one, dtype_two)
+
+
+# defaults to recast to for abstract numeric types, same as numpy would choose
+_abstract_dtype_defaults = {np.number          : np.float64,
+                            np.inexact         : np.float64,
+                            np.floating        : np.float64,
+                            np.complexfloating : np.complex128,
+                            np.integer         : np.int64,
+                            np.signedinteger   : np.int64,
+                            np.unsignedinteger : np.uint64}
+
+def _concrete_dtype(ensure_dtype):
+    """Dtype to recast to, with defaults for abstract numeric types e.g. number"""
+
+    return _abstract_dtype_defaults.get(ensure_dtype, ensure_dtype)
+
+
 def check_callable(input_func, min_num_args=2):
     """Ensures the input func 1) is callable, and 2) can accept a min # of args"""
 
     if not callable(input_func):
         raise TypeError('Input function must be callable!')
 
-    from inspect import signature
     # would not work for C/builtin functions such as numpy.dot
     func_signature = signature(input_func)
 
@@ -109,25 +149,90 @@ def get_callable_name(input_func, name=None):
     """Returns the callable name"""
 
     if name is None:
-        if hasattr(input_func, '__name__'):
-            return input_func.__name__
-        else:
-            return ''
+        return getattr(input_func, '__name__', '')
     else:
         return str(name)
 
 _float_eps = np.finfo('float').eps
 
-def _ensure_min_eps(x):
-    return  np.maximum(_float_eps, x)
+def _ensure_min_eps(x, out=None):
+    """Ensures values are at least eps, e.g. to avoid division by zero.
 
-def not_symmetric(matrix):
-    """Returns true if the input matrix is not symmetric."""
+    Passing out=x clamps an array in-place, avoiding the allocation of another.
+    """
+
+    return np.maximum(_float_eps, x, out=out)
+
+# number of rows compared at a time when checking for symmetry
+_sym_check_block_size = 256
+
+def not_symmetric(matrix, rtol=1e-05, atol=1e-08):
+    """
+    Returns true if the input matrix is not symmetric.
+
+    Upper triangle is compared to the lower triangle one block of rows at a time,
+    returning as soon as a mismatch is found, instead of allocating a full NxN
+    boolean array as in ``np.isclose(matrix, matrix.T).all()``.
+    """
 
-    if not np.isclose(matrix, matrix.T).all():
+    matrix = np.asarray(matrix)
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
         return True
-    else:
-        return False
+
+    if matrix.dtype == np.float64:
+        return _not_symmetric_float64(matrix, rtol, atol)
+
+    num_rows = matrix.shape[0]
+    for start in range(0, num_rows, _sym_check_block_size):
+        stop = min(start + _sym_check_block_size, num_rows)
+        upper = matrix[start:stop, start:]
+        lower = matrix[start:, start:stop].T
+        if not np.allclose(upper, lower, rtol=rtol, atol=atol):
+            return True
+
+    return False
+
+
+def _not_symmetric_float64(matrix, rtol, atol):
+    """
+    Symmetry check for large float64 matrices, with no allocations per block.
+
+    Differences, tolerances and their comparison are computed into buffers
+    allocated once, instead of the many temporaries allocated within each call
+    to np.allclose.
+    """
+
+    num_rows = matrix.shape[0]
+    buffer_size = min(_sym_check_block_size, num_rows) * num_rows
+    diff_buffer = np.empty(buffer_size)
+    tol_buffer = np.empty(buffer_size)
+    close_buffer = np.empty(buffer_size, dtype=bool)
+
+    for start in range(0, num_rows, _sym_check_block_size):
+        stop = min(start + _sym_check_block_size, num_rows)
+        upper = matrix[start:stop, start:]
+        lower = matrix[start:, start:stop].T
+
+        diff = diff_buffer[:upper.size].reshape(upper.shape)
+        # inf - inf results in NaN, which is handled below
+        with np.errstate(invalid='ignore'):
+            np.subtract(upper, lower, out=diff)
+        np.abs(diff, out=diff)
+
+        tol = tol_buffer[:upper.size].reshape(upper.shape)
+        np.abs(lower, out=tol)
+        tol *= rtol
+        tol += atol
+
+        close = close_buffer[:upper.size].reshape(upper.shape)
+        np.less_equal(diff, tol, out=close)
+
+        # confirming with np.allclose, which treats equal infinities as close
+        if not close.all() and \
+            not np.allclose(upper, lower, rtol=rtol, atol=atol):
+            return True
+
+    return False
 
 def check_operation_kernel_matrix(operation):
     """Validates whether input is a valid operation on KernelMatrices"""
@@ -141,13 +246,25 @@ def check_operation_kernel_matrix(operation):
 
 
 def min_max_scale(array):
-    """Rescale the array values from 0 to 1 via min-max normalization."""
+    """Rescale the array values from 0 to 1 via min-max normalization.
 
-    array = np.array(array)
+    Returns all zeros when all the values are identical.
+    """
+
+    array = np.asarray(array, dtype=np.float64)
     min_val = array.min()
-    return (array - min_val) / (np.max(array) - min_val)
+    span = array.max() - min_val
+    if span == 0:
+        return np.zeros_like(array)
+
+    # single output allocation, with the division done in-place
+    scaled = np.subtract(array, min_val)
+    scaled /= span
+    return scaled
 
 
+_sparse_formats_flat_data = ('csr', 'csc', 'coo', 'bsr')
+
 def contains_nan_inf(matrix):
     """
     Helper func to check for the presence of NaN or Inf.
@@ -155,25 +272,43 @@ def contains_nan_inf(matrix):
     Returns True if any element is not finite (Inf) or NaN. Returns False otherwise.
 
     This is designed to works for both dense and sparse matrices!
+    For sparse matrices, only the stored values are checked, as the implicit
+    zeros are always finite.
     """
 
     if issparse(matrix):
-        matrix = matrix.todense()
+        # other formats do not keep their stored values in a flat ndarray
+        if matrix.format not in _sparse_formats_flat_data:
+            matrix = matrix.tocsr()
+        matrix = matrix.data
 
-    if (not np.isfinite(matrix).all()) \
-        or (np.isnan(matrix).any()):
-        return True
-    else:
-        return False
+    # np.isfinite is False for NaN as well, so a single pass covers both
+    return not np.isfinite(matrix).all()
 
 
+_sentinel = object()
+
 def is_iterable_but_not_str(input_obj, min_length=1):
-    """Boolean check for iterables that are not strings and of a minimum length"""
+    """
+    Boolean check for iterables that are not strings and of a minimum length
 
-    if not (not isinstance(input_obj, str) and isinstance(input_obj, Iterable)):
+    Iterables without a length are counted via a fresh iterator, without
+    consuming them. One-shot iterators such as generators can not be counted
+    without being consumed, and hence are rejected.
+    """
+
+    if isinstance(input_obj, str) or not isinstance(input_obj, Iterable):
         return False
 
-    if len(input_obj) < min_length:
+    if isinstance(input_obj, Sized):
+        return len(input_obj) >= min_length
+
+    iterator = iter(input_obj)
+    if iterator is input_obj:
         return False
-    else:
-        return True
+
+    for _ in range(min_length):
+        if next(iterator, _sentinel) is _sentinel:
+            return False
+
+    return True